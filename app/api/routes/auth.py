@@ -1,23 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response, status, Body
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.database.connection import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin
+from app.schemas.user import UserCreate, UserLogin, UserStatusUpdate
 from app.schemas.token import Token
-from app.auth.utils import hash_password, verify_password, create_access_token
-from app.config.settings import settings
-from app.auth.dependencies import get_current_user, is_admin 
-from app.config.helpers import get_user_or_404 
-from pydantic import BaseModel, ValidationError
+from app.auth.utils import (
+    hash_password, hash_password_async, verify_password_async,
+    password_needs_rehash, create_access_token
+)
+from app.auth.dependencies import invalidate_cached_user, is_admin_from_token
+from app.config.helpers import get_user_or_404, is_not_modified, make_etag
+from pydantic import ValidationError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-class UserStatusUpdate(BaseModel):
-    status: bool
+# Verified against when the email is unknown, so failed logins cost the same either way
+_DUMMY_PASSWORD_HASH = hash_password("not-a-real-password")
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user with password validation
     
@@ -33,25 +37,25 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     - **password**: User's password (required, must meet security requirements)
     """
     try:
-        existing_user = db.query(User).filter(User.email == user.email).first()
-        if existing_user:
+        email_taken = await db.scalar(select(exists().where(User.email == user.email)))
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        hashed_password = hash_password(user.password)
+        hashed_password = await hash_password_async(user.password)
         
-        # Create new user
-        new_user = User(
-            full_name=user.full_name,
-            email=user.email,
-            hashed_password=hashed_password,
-            user_status=True 
-        )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        # Create new user, reading back only what the response needs
+        new_user = (await db.execute(
+            insert(User).values(
+                full_name=user.full_name,
+                email=user.email,
+                hashed_password=hashed_password,
+                user_status=True
+            ).returning(User.id, User.user_status)
+        )).one()
+        await db.commit()
         
         return {
             "message": "User created successfully", 
@@ -77,7 +81,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Login user and get access token
     
@@ -86,9 +90,17 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     
     Returns JWT token for authentication
     """
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    # Only the columns login needs, not a full ORM instance
+    user = (await db.execute(
+        select(User.id, User.email, User.hashed_password, User.user_status)
+        .where(User.email == user_credentials.email)
+    )).one_or_none()
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    password_valid = await verify_password_async(
+        user_credentials.password,
+        user.hashed_password if user else _DUMMY_PASSWORD_HASH
+    )
+    if not user or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -102,20 +114,24 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, 
-        expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Lazily migrate legacy (bcrypt) or outdated hashes while the plain password is at hand
+    if password_needs_rehash(user.hashed_password):
+        await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=await hash_password_async(user_credentials.password))
+        )
+        await db.commit()
+
+    access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+    return ORJSONResponse({"access_token": access_token, "token_type": "bearer"})
 
 @router.patch("/users/{user_id}/status", status_code=status.HTTP_200_OK)
-def update_user_status(
+async def update_user_status(
     user_id: int,
     status_update: UserStatusUpdate = Body(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    admin_check: bool = Depends(is_admin)  
+    db: AsyncSession = Depends(get_db),
+    admin_check: bool = Depends(is_admin_from_token)  
 ):
     """
     Update user active status (Admin only)
@@ -123,59 +139,102 @@ def update_user_status(
     - **user_id**: ID of user to update
     - **status**: boolean (true=active, false=inactive)
     """
-    user = get_user_or_404(db, user_id)
-
-    user.user_status = status_update.status
-    db.commit()
-    db.refresh(user) 
+    # Write and read back in one round trip; unchanged rows are not rewritten
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.user_status.is_distinct_from(status_update.status))
+        .values(user_status=status_update.status)
+        .returning(User.id, User.email, User.user_status, User.updated_at)
+    )
+    user = result.one_or_none()
+    if user is None:
+        # Either the user does not exist (404) or already has this status
+        user = await get_user_or_404(db, user_id)
+    else:
+        await db.commit()
+        invalidate_cached_user(user.id)
     
-    return {
+    return ORJSONResponse({
         "message": "User status updated successfully",
         "user_id": user.id,
         "new_status": "active" if user.user_status else "inactive",
-        "updated_at": user.updated_at  
-    }
+        "updated_at": user.updated_at
+    })
 
 @router.get("/users/{user_id}", status_code=status.HTTP_200_OK)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    admin_check: bool = Depends(is_admin)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    admin_check: bool = Depends(is_admin_from_token)
 ):
     """
     Get user details (Admin only)
     
+    Responses carry an ETag; send it back in If-None-Match to get a
+    304 Not Modified when the user has not changed.
+    
     - **user_id**: ID of user to retrieve
     """
-    user = get_user_or_404(db, user_id)
+    user = await get_user_or_404(db, user_id)
+
+    etag = make_etag(user.id, user.updated_at)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return {
+    return ORJSONResponse({
         "user_id": user.id,
         "full_name": user.full_name,
         "email": user.email,
         "user_status": user.user_status,
         "created_at": user.created_at,
         "updated_at": user.updated_at
-    }
+    }, headers=headers)
 
 @router.get("/users", status_code=status.HTTP_200_OK)
-def get_all_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    admin_check: bool = Depends(is_admin),
-    page: int = 1,
-    per_page: int = 10
+async def get_all_users(
+    db: AsyncSession = Depends(get_db),
+    admin_check: bool = Depends(is_admin_from_token),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1),
+    after_id: Optional[int] = None
 ):
     """
     Get all users with pagination (Admin only)
     
-    - **page**: Page number (starts from 1)
+    - **page**: Page number (starts from 1), ignored when after_id is given
     - **per_page**: Items per page (default: 10)
+    - **after_id**: Only return users with an ID greater than this one;
+      pass the previous response's next_cursor to fetch the next page
+    
+    total is the number of users matching the query (when after_id is
+    given, the users after the cursor), counted in the same round trip;
+    a page past the end costs one extra count query.
     """
-    users = db.query(User).offset((page - 1) * per_page).limit(per_page).all()
+    query = select(
+        User.id,
+        User.full_name,
+        User.email,
+        User.user_status,
+        User.created_at,
+        User.updated_at,
+        func.count().over().label("total")
+    ).order_by(User.id)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    else:
+        query = query.offset((page - 1) * per_page)
+    users = (await db.execute(query.limit(per_page))).all()
+    if users:
+        total = users[0].total
+    elif after_id is None and page > 1:
+        # No rows to carry the window count, so count separately
+        total = await db.scalar(select(func.count()).select_from(User))
+    else:
+        total = 0
     
-    return {
+    return ORJSONResponse({
         "users": [
             {
                 "user_id": user.id,
@@ -189,5 +248,6 @@ def get_all_users(
         ],
         "page": page,
         "per_page": per_page,
-        "total": len(users)
-    }
\ No newline at end of file
+        "total": total,
+        "next_cursor": users[-1].id if len(users) == per_page else None
+    })
\ No newline at end of file
@@ -1,153 +1,216 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.database.connection import get_db
-from app.models.user import User
 from app.models.todo import Todo
+from app.models.user import User
 from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
-from app.auth.dependencies import get_current_user, is_admin
+from app.config.helpers import is_not_modified, make_etag
+from app.auth.dependencies import AuthenticatedUser, TokenUser, check_admin, get_current_user, get_token_user
 
 router = APIRouter(prefix="/todos", tags=["Todos"])
 
-@router.get("/", response_model=List[TodoResponse])
-def get_todos(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    page: int = 1,
-    per_page: int = 10
+# Bound once so create_todo calls pydantic-core directly
+_todo_create_validator = TodoCreate.__pydantic_validator__
+
+# Columns of a TodoResponse payload; the owner's name and email come from users
+_TODO_COLUMNS = (
+    Todo.id,
+    Todo.user_id,
+    User.full_name,
+    User.email,
+    Todo.task,
+    Todo.completed,
+    Todo.created_at,
+    Todo.updated_at
+)
+
+def _scoped(query, current_user: TokenUser):
+    """Limit a todos statement to rows the current user may access"""
+    if check_admin(current_user):
+        return query
+    return query.where(Todo.user_id == current_user.id)
+
+def _todo_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Todo not found"
+    )
+
+async def get_authorized_todo(
+    todo_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenUser = Depends(get_token_user)
+) -> dict:
+    """
+    Get a todo the current user may access or raise 404.
+    
+    Admins can reach any todo; other users only their own, with ownership
+    enforced in the query itself rather than after loading the row.
+    """
+    query = select(*_TODO_COLUMNS).join(User, User.id == Todo.user_id).where(Todo.id == todo_id)
+    todo = (await db.execute(_scoped(query, current_user))).mappings().one_or_none()
+    if todo is None:
+        raise _todo_not_found()
+    return dict(todo)
+
+@router.get("/", response_model=None, responses={200: {"model": List[TodoResponse]}})
+async def get_todos(
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenUser = Depends(get_token_user),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1),
+    after_id: Optional[int] = None
 ):
     """
     Get todos
-    - page: Page number (starts from 1)
+    - page: Page number (starts from 1), ignored when after_id is given
     - per_page: Items per page (default: 10)
+    - after_id: Only return todos with an ID greater than this one; pass the
+      previous response's X-Next-Cursor header to fetch the next page
     """
-    try:
-        admin_check = is_admin(current_user)
-        query = db.query(Todo)
-    except HTTPException:
-        query = db.query(Todo).filter(Todo.user_id == current_user.id)
-    
-    todos = query.offset((page - 1) * per_page).limit(per_page).all()
-    return todos
+    # Plain column rows skip ORM instance construction and identity-map bookkeeping
+    query = _scoped(
+        select(*_TODO_COLUMNS).join(User, User.id == Todo.user_id).order_by(Todo.id),
+        current_user
+    )
+    if after_id is not None:
+        query = query.where(Todo.id > after_id)
+    else:
+        query = query.offset((page - 1) * per_page)
 
-@router.post("/", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
-def create_todo(
-    todo: TodoCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    todos = [dict(row) for row in (await db.execute(query.limit(per_page))).mappings()]
+    headers = {"X-Next-Cursor": str(todos[-1]["id"])} if len(todos) == per_page else None
+    return ORJSONResponse(todos, headers=headers)
+
+@router.post(
+    "/",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"model": TodoResponse},
+        # The body is validated by hand, so declare FastAPI's usual 422 ourselves
+        422: {
+            "description": "Validation Error",
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}}
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": TodoCreate.model_json_schema()}}
+        }
+    }
+)
+async def create_todo(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Create a new todo
     - **task**: Todo task description (required, cannot be empty)
     - **completed**: Whether task is completed (default: false)
     """
-    new_todo = Todo(
-        user_id=current_user.id,
-        full_name=current_user.full_name, 
-        email=current_user.email,         
-        task=todo.task,
-        completed=todo.completed
-    )
-    db.add(new_todo)
-    db.commit()
-    db.refresh(new_todo)
-    return new_todo
+    # Validate the raw JSON body in pydantic-core directly instead of decoding
+    # it to a dict first and running it through FastAPI's body field
+    try:
+        todo = _todo_create_validator.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
 
-@router.get("/{todo_id}", response_model=TodoResponse)
-def get_todo(
-    todo_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+    # A single INSERT ... RETURNING, skipping the unit-of-work flush
+    new_todo = (await db.execute(
+        insert(Todo).values(
+            user_id=current_user.id,
+            task=todo.task,
+            completed=todo.completed
+        ).returning(Todo.id, Todo.user_id, Todo.task, Todo.completed, Todo.created_at, Todo.updated_at)
+    )).one()
+    await db.commit()
+    return ORJSONResponse({
+        "id": new_todo.id,
+        "user_id": new_todo.user_id,
+        "full_name": current_user.full_name,
+        "email": current_user.email,
+        "task": new_todo.task,
+        "completed": new_todo.completed,
+        "created_at": new_todo.created_at,
+        "updated_at": new_todo.updated_at
+    }, status_code=status.HTTP_201_CREATED)
+
+@router.get("/{todo_id}", response_model=None, responses={200: {"model": TodoResponse}})
+async def get_todo(request: Request, todo: dict = Depends(get_authorized_todo)):
     """
     Get a specific todo by ID
-    - **todo_id**: ID of the todo to retrieve
-    """
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Todo not found"
-        )
     
-    try:
-        is_admin(current_user)
-    except HTTPException:
-        if todo.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this todo"
-            )
+    Responses carry an ETag; send it back in If-None-Match to get a
+    304 Not Modified when the todo has not changed.
     
-    return todo
+    - **todo_id**: ID of the todo to retrieve
+    """
+    etag = make_etag(todo["id"], todo["created_at"], todo["updated_at"])
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-@router.put("/{todo_id}", response_model=TodoResponse)
-def update_todo(
+    return ORJSONResponse(todo, headers=headers)
+
+@router.put("/{todo_id}", response_model=None, responses={200: {"model": TodoResponse}})
+async def update_todo(
     todo_id: int,
     todo_update: TodoUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """
     Update a todo (partial update allowed)
     - **todo_id**: ID of the todo to update
-    - **full_name**: New full name (optional)
-    - **email**: New email address (optional)
     - **task**: New task description (optional)
     - **completed**: New completion status (optional)
     """
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Todo not found"
-        )
-    
-    try:
-        is_admin(current_user)
+    values = {field: getattr(todo_update, field) for field in todo_update.model_fields_set}
+    if not values:
+        return ORJSONResponse(await get_authorized_todo(todo_id, db, current_user))
 
-    except HTTPException:
-        if todo.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this todo"
-            )
-    
-    update_data = todo_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(todo, field, value)
-    
-    db.commit()
-    db.refresh(todo)
-    return todo
+    # Update and read back, owner columns included, in one UPDATE ... FROM users RETURNING.
+    # Issued against the table so the ORM does not try to map the joined columns.
+    query = (
+        update(Todo.__table__)
+        .where(Todo.id == todo_id, User.id == Todo.user_id)
+        .values(**values)
+        .returning(*_TODO_COLUMNS)
+    )
+    todo = (await db.execute(_scoped(query, current_user))).mappings().one_or_none()
+    if todo is None:
+        raise _todo_not_found()
+    await db.commit()
+    return ORJSONResponse(dict(todo))
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+async def delete_todo(
     todo_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """
     Delete a todo
     
     - **todo_id**: ID of the todo to delete
     """
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Todo not found"
-        )
-    
-    try:
-        is_admin(current_user)
-    except HTTPException:
-        if todo.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to delete this todo"
-            )
-    
-    db.delete(todo)
-    db.commit()
-    return None
\ No newline at end of file
+    query = (
+        delete(Todo)
+        .where(Todo.id == todo_id)
+        .returning(Todo.id)
+        .execution_options(synchronize_session=False)
+    )
+    if await db.scalar(_scoped(query, current_user)) is None:
+        raise _todo_not_found()
+    await db.commit()
+    return None
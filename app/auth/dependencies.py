@@ -1,39 +1,80 @@
+from typing import NamedTuple, Union
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from jwt import PyJWTError
 from app.database.connection import get_db
 from app.models.user import User
 from app.config.settings import settings
+from app.auth.utils import decode_access_token
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """Get current authenticated user from JWT token"""
-    credentials_exception = HTTPException(
+class TokenUser(NamedTuple):
+    """Identity carried by the access token itself, available without a DB query"""
+    id: int
+    email: str
+    is_admin: bool
+
+class AuthenticatedUser(NamedTuple):
+    """Snapshot of the fields request handlers need from the current user"""
+    id: int
+    full_name: str
+    email: str
+    user_status: bool
+    is_admin: bool
+
+# Principals resolved from recent tokens, keyed by user id, so repeat requests skip
+# the DB. Entries live for at most 30 seconds; status changes must invalidate them.
+_user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a cached user so the next request reloads it from the database"""
+    _user_cache.pop(user_id, None)
+
+async def get_token_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenUser:
+    """Get the caller's id and admin status from the JWT alone, without touching the DB"""
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.email == email).first()
+        payload = decode_access_token(credentials.credentials)
+        user_id = int(payload["sub"])
+    except (PyJWTError, ValueError):
+        raise _credentials_exception()
+    email = payload["email"]
+    return TokenUser(id=user_id, email=email, is_admin=settings.is_admin_email(email))
+
+async def get_current_user(token_user: TokenUser = Depends(get_token_user), db: AsyncSession = Depends(get_db)) -> AuthenticatedUser:
+    """Get current authenticated user from JWT token"""
+    user = _user_cache.get(token_user.id)
     if user is None:
-        raise credentials_exception
+        # Primary key lookup of only the columns the principal needs
+        row = (await db.execute(
+            select(User.id, User.full_name, User.email, User.user_status)
+            .where(User.id == token_user.id)
+        )).one_or_none()
+        if row is None:
+            raise _credentials_exception()
+        user = AuthenticatedUser(*row, is_admin=settings.is_admin_email(row.email))
+        _user_cache[token_user.id] = user
     return user
 
-def is_admin(current_user: User = Depends(get_current_user)):
-    """Check if user is admin"""
-    if current_user.email not in settings.ADMIN_EMAILS:
+def check_admin(user: Union[TokenUser, AuthenticatedUser]) -> bool:
+    """Return whether user is an admin, without raising"""
+    return user.is_admin
+
+async def is_admin_from_token(token_user: TokenUser = Depends(get_token_user)) -> bool:
+    """Check admin rights from the token's email claim alone, without loading the user"""
+    if not check_admin(token_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required"
         )
-    return True
\ No newline at end of file
+    return True
@@ -1,26 +1,142 @@
-from passlib.context import CryptContext
-from jose import jwt
-from datetime import datetime, timedelta
+"""
+Password hashing and JWT helpers.
+
+Hashing and verifying passwords is deliberately slow CPU work, so async
+handlers must not call hash_password/verify_password directly; use the
+*_async variants, which run them on a worker thread. Token decoding is a
+cheap HMAC check backed by a cache and is fine to call inline.
+"""
+import bcrypt
+import hashlib
+import threading
+import time
+from argon2 import PasswordHasher, Type, extract_parameters
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TLRUCache
+from fastapi.concurrency import run_in_threadpool
+import jwt
+import orjson
+from datetime import timedelta
 from typing import Optional
 from app.config.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_ARGON2_MEMORY_COST = 65536
+# Calibration never suggests less than the shipped ARGON2_TIME_COST default
+_MIN_ARGON2_TIME_COST = 2
+_MAX_ARGON2_TIME_COST = 10
+
+def calibrate_time_cost(target_ms: int) -> int:
+    """Largest Argon2 time cost whose hash still fits within target_ms on this machine (never below the minimum)"""
+    time_cost = _MIN_ARGON2_TIME_COST
+    while time_cost < _MAX_ARGON2_TIME_COST:
+        candidate = PasswordHasher(time_cost=time_cost + 1, memory_cost=_ARGON2_MEMORY_COST, parallelism=1)
+        start = time.perf_counter()
+        candidate.hash("calibration")
+        if (time.perf_counter() - start) * 1000 > target_ms:
+            break
+        time_cost += 1
+    return time_cost
+
+# New hashes use Argon2id through argon2-cffi directly
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=_ARGON2_MEMORY_COST,
+    parallelism=1,
+)
+
+# Token verification results keyed by token digest. Entries are (claims, expires_at);
+# valid tokens are kept for at most a minute and never past their own exp,
+# rejected ones (claims=None) briefly so replayed bad tokens skip the HMAC work.
+_CLAIMS_CACHE_TTL = 60
+_INVALID_TOKEN_CACHE_TTL = 5
+_claims_cache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _key, entry, _now: entry[1],
+    timer=time.time,
+)
+_claims_cache_lock = threading.Lock()
+
+# Signing parameters are fixed for the process, so build them once
+_SECRET_BYTES = settings.SECRET_KEY.encode()
+_ACCESS_TOKEN_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+# One signer restricted to our algorithm; claims are serialized with orjson up front
+_JWS = jwt.PyJWS(algorithms=[settings.ALGORITHM])
+_JWT_DECODE_KWARGS = {
+    "key": _SECRET_BYTES,
+    "algorithms": [settings.ALGORITHM],
+    "options": {"require": ["exp", "sub", "email"]},
+}
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    """Hash a password using the default (Argon2id) scheme"""
+    return _password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password.startswith("$argon2"):
+        # Legacy bcrypt hash from before the switch to Argon2id
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a deprecated scheme or weaker parameters than configured"""
+    if not hashed_password.startswith("$argon2"):
+        return True
+    try:
+        params = extract_parameters(hashed_password)
+    except InvalidHashError:
+        return True
+    # Only upgrade; hashes stronger than the current config are left alone
+    return (
+        params.type is not Type.ID
+        or params.time_cost < settings.ARGON2_TIME_COST
+        or params.memory_cost < _ARGON2_MEMORY_COST
+    )
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on a worker thread so async handlers don't block the event loop"""
+    return await run_in_threadpool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on a worker thread so async handlers don't block the event loop"""
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Create JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    """Create JWT access token, expiring after ACCESS_TOKEN_EXPIRE_MINUTES by default"""
+    lifetime = expires_delta.total_seconds() if expires_delta else _ACCESS_TOKEN_EXPIRE_SECONDS
+    # exp as epoch seconds straight from time.time(), no datetime round trip
+    expire = int(time.time() + lifetime)
+    return _JWS.encode(orjson.dumps({**data, "exp": expire}), _SECRET_BYTES, algorithm=settings.ALGORITHM)
+
+def decode_access_token(token: str) -> dict:
+    """Verify a JWT and return its claims, reusing recent results for the same token"""
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _claims_cache_lock:
+        entry = _claims_cache.get(cache_key)
+    if entry is None:
+        now = time.time()
+        try:
+            claims = jwt.decode(token, **_JWT_DECODE_KWARGS)
+        except jwt.PyJWTError:
+            with _claims_cache_lock:
+                _claims_cache[cache_key] = (None, now + _INVALID_TOKEN_CACHE_TTL)
+            raise
+        entry = (claims, min(claims["exp"], now + _CLAIMS_CACHE_TTL))
+        with _claims_cache_lock:
+            _claims_cache[cache_key] = entry
+    claims = entry[0]
+    if claims is None:
+        raise jwt.InvalidTokenError("Token failed verification")
+    return claims
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 2 or not sys.argv[1].isdigit():
+        sys.exit("usage: python -m app.auth.utils <target_ms>")
+    print(calibrate_time_cost(int(sys.argv[1])))
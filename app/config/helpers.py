@@ -1,11 +1,16 @@
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+import hashlib
+from fastapi import HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 
-def get_user_or_404(db: Session, user_id: int) -> User:
+async def get_user_or_404(db: AsyncSession, user_id: int) -> User:
     """
     Get user by ID or raise 404 if not found.
     
+    Uses a primary-key lookup, so a user already loaded in this session is
+    returned from the identity map without another query.
+    
     Args:
         db: Database session
         user_id: ID of the user to retrieve
@@ -16,7 +21,7 @@ def get_user_or_404(db: Session, user_id: int) -> User:
     Raises:
         HTTPException: 404 if user not found
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -24,7 +29,7 @@ def get_user_or_404(db: Session, user_id: int) -> User:
         )
     return user
 
-def get_user_by_email_or_404(db: Session, email: str) -> User:
+async def get_user_by_email_or_404(db: AsyncSession, email: str) -> User:
     """
     Get user by email or raise 404 if not found.
     
@@ -38,10 +43,47 @@ def get_user_by_email_or_404(db: Session, email: str) -> User:
     Raises:
         HTTPException: 404 if user not found
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with email {email} not found"
         )
-    return user
\ No newline at end of file
+    return user
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from values that change whenever the resource does.
+    
+    Args:
+        *parts: Values identifying the resource version (e.g. id, updated_at)
+        
+    Returns:
+        str: Quoted weak ETag suitable for the ETag response header
+    """
+    digest = hashlib.blake2b(
+        ":".join(str(part) for part in parts).encode(), digest_size=8
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header already covers etag,
+    using weak comparison (a W/ prefix on either side is ignored).
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the requested resource
+        
+    Returns:
+        bool: True if a 304 Not Modified response can be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
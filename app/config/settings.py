@@ -8,20 +8,44 @@ class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Argon2 passes per hash; pick it offline with `python -m app.auth.utils <target_ms>`
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "2"))
 
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "todo_user")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "password")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "todo")
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
+
+    # Connection pool configuration
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    # Pinging costs an extra round trip per checkout but replaces connections the
+    # server or a proxy closed while idle; only turn it off if pool_recycle is
+    # shorter than every idle timeout in between
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # "null" disables app-side pooling, e.g. behind PgBouncer in transaction mode
+    DB_POOL_CLASS: str = os.getenv("DB_POOL_CLASS", "queue").lower()
+    # Create missing tables on startup; leave off where the schema is managed separately
+    INIT_DB: bool = os.getenv("INIT_DB", "false").lower() == "true"
+    # Development mode: auto-reload with a single worker when run via main.py
+    DEV: bool = os.getenv("DEV", "false").lower() == "true"
+    # Worker processes started by main.py; each opens its own connection pool
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+    # Log every SQL statement; only useful while debugging
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() == "true"
     
-    # Admin Configuration
-    ADMIN_EMAILS: list[str] = [
+    # Admin Configuration (lower-cased so admin checks are a single hash lookup)
+    ADMIN_EMAILS: frozenset[str] = frozenset(email.lower() for email in {
         "admin@example.com",
-    ]
+    })
+
+    def is_admin_email(self, email: str) -> bool:
+        return email.lower() in self.ADMIN_EMAILS
     
     @property
     def database_url(self) -> str:
-        return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
 settings = Settings()
\ No newline at end of file
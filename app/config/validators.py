@@ -1,5 +1,19 @@
 import re
-from typing import List, Optional
+import string
+from typing import Annotated, List, Optional
+from pydantic import StringConstraints
+
+# Stripped and checked for emptiness inside pydantic-core, without a Python validator
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_SPECIAL = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+# Every rule at once, so the common (valid) case is a single match in the regex engine
+_VALID_PASSWORD = re.compile(
+    r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[!@#$%^&*()_+\-=\[\]{}|;:,.<>?]).{8,}",
+    re.DOTALL
+)
 
 def validate_password(password: str) -> tuple[bool, Optional[List[str]]]:
     """
@@ -15,22 +29,56 @@ def validate_password(password: str) -> tuple[bool, Optional[List[str]]]:
     Returns:
         tuple: (is_valid, list_of_error_messages)
     """
+    if _VALID_PASSWORD.fullmatch(password):
+        return True, None
+
     errors = []
     
     if len(password) < 8:
         errors.append("Password must be at least 8 characters long")
 
-    if not re.search(r'[A-Z]', password):
+    # Classify every character in a single pass instead of one regex scan per rule
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if char in _UPPERCASE:
+            has_upper = True
+        elif char in _LOWERCASE:
+            has_lower = True
+        elif char.isdecimal():
+            has_digit = True
+        elif char in _SPECIAL:
+            has_special = True
+
+    if not has_upper:
         errors.append("Password must contain at least one uppercase letter")
 
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         errors.append("Password must contain at least one lowercase letter")
 
-    if not re.search(r'\d', password):
+    if not has_digit:
         errors.append("Password must contain at least one number")
 
-    if not re.search(r'[!@#$%^&*()_+\-=\[\]{}|;:,.<>?]', password):
+    if not has_special:
         errors.append("Password must contain at least one special character (!@#$%^&*()_+-=[]{}|;:,.<>?)")
 
     is_valid = len(errors) == 0
     return is_valid, errors if not is_valid else None
+
+# Compiled once; a syntax check only, with no IDNA normalisation or deliverability lookups
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+def normalize_email(email: str) -> str:
+    """
+    Check that an email address has a local@domain.tld shape
+
+    Returns:
+        str: the address, stripped of surrounding whitespace, with its domain lower-cased
+
+    Raises:
+        ValueError: if the address is not valid
+    """
+    email = email.strip()
+    if not _EMAIL.fullmatch(email):
+        raise ValueError('value is not a valid email address')
+    local, domain = email.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
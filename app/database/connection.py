@@ -1,61 +1,66 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import text
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import AsyncIterator
 from app.config.settings import settings
-import time
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-engine = create_engine(
-    settings.database_url,
-    echo=True,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_timeout=20,
-    max_overflow=0
-)
+if settings.DB_POOL_CLASS == "null":
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": 20,
+        # Reuse the most recently returned connection so a small hot set stays warm
+        "pool_use_lifo": True
+    }
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(settings.database_url, echo=settings.SQL_ECHO, **pool_options)
+
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    # Handlers that write commit explicitly; anything left uncommitted is
+    # rolled back when the session closes, so reads cost no COMMIT
+    async with SessionLocal() as db:
         yield db
-        db.commit()  
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-def wait_for_db(max_retries=30, delay=2):
+
+async def wait_for_db(max_retries=30, delay=2):
     """Wait for database to be ready"""
     for attempt in range(max_retries):
         try:
-            with engine.connect() as connection:
-                connection.execute(text("SELECT 1"))
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
             logger.info("Database is ready!")
             return True
         except Exception as e:
             logger.info(f"Database not ready (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
-                time.sleep(delay)
+                await asyncio.sleep(delay)
             else:
                 logger.error("Database connection failed after all retries")
                 raise
     return False
 
-def create_tables():
+async def create_tables():
     """Create all tables with explicit error handling and retry logic"""
     try:
         logger.info("Waiting for database to be ready...")
-        wait_for_db()
+        await wait_for_db()
         
         logger.info("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
         logger.info("Tables created successfully!")
         return True
     except Exception as e:
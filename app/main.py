@@ -1,17 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.database.connection import create_tables
 from app.api.routes import auth, todos
 from app.config.settings import settings
 
-# Create tables
-try:
-    create_tables()
-except Exception as e:
-    print(f"Failed to create tables: {e}")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables only when asked to, so regular worker starts skip the DDL round trips
+    if settings.INIT_DB:
+        try:
+            await create_tables()
+        except Exception as e:
+            print(f"Failed to create tables: {e}")
+    yield
 
 # FastAPI application
 app = FastAPI(
-    title="Simple Todo API"
+    title="Simple Todo API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Include routers
@@ -60,4 +68,13 @@ if __name__ == "__main__":
     print("Starting Todo API server with PostgreSQL...")
     print(f"Connecting to database at: {settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}")
     print("API Documentation will be available at: http://127.0.0.1:8000/docs")
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # uvicorn[standard] supplies uvloop and httptools, which "auto" picks up where available
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="auto",
+        http="auto",
+        reload=settings.DEV,
+        workers=None if settings.DEV else settings.WORKERS
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.connection import Base
@@ -6,14 +6,16 @@ from app.database.connection import Base
 class Todo(Base):
     """Todo table to store todo items"""
     __tablename__ = "todos"
+    __table_args__ = (
+        # Serves per-user listing and the owner-scoped single-todo lookup
+        Index("ix_todos_user_id_id", "user_id", "id"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    full_name = Column(String, nullable=False)
-    email = Column(String, nullable=False)
     task = Column(String, nullable=False)
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    owner = relationship("User", back_populates="todos")
\ No newline at end of file
+    owner = relationship("User", back_populates="todos", lazy="raise")
\ No newline at end of file
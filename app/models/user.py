@@ -7,7 +7,7 @@ class User(Base):
     """User table to store user information"""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     full_name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     user_status = Column(Boolean, default=True, nullable=False) 
@@ -16,4 +16,4 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
-    todos = relationship("Todo", back_populates="owner")
\ No newline at end of file
+    todos = relationship("Todo", back_populates="owner", lazy="raise")
\ No newline at end of file
@@ -1,35 +1,22 @@
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
+from app.config.validators import NonEmptyStr
 
 class TodoCreate(BaseModel):
     """Schema for creating a new todo"""
-    task: str
+    task: NonEmptyStr
     completed: bool = False
-    
-    @field_validator('task')
-    @classmethod
-    def validate_task(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Task cannot be empty')
-        return v.strip()
 
 class TodoUpdate(BaseModel):
     """Schema for updating a todo"""
-    task: Optional[str] = None
+    task: Optional[NonEmptyStr] = None
     completed: Optional[bool] = None
-    
-    @field_validator('task')
-    @classmethod
-    def validate_task(cls, v):
-        if v is not None: 
-            if not v.strip():
-                raise ValueError('Task cannot be empty')
-            return v.strip()
-        return v
 
 class TodoResponse(BaseModel):
     """Schema for todo response"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     user_id: int
     full_name: str
@@ -37,7 +24,4 @@ class TodoResponse(BaseModel):
     task: str
     completed: bool
     created_at: datetime
-    updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    updated_at: Optional[datetime] = None
\ No newline at end of file
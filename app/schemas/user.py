@@ -1,19 +1,17 @@
-from pydantic import BaseModel, EmailStr, field_validator
-from app.config.validators import validate_password
+from pydantic import BaseModel, field_validator
+from app.config.validators import NonEmptyStr, normalize_email, validate_password
 from fastapi import HTTPException, status
 
 class UserCreate(BaseModel):
     """Schema for creating a new user"""
-    full_name: str
-    email: EmailStr
+    full_name: NonEmptyStr
+    email: str
     password: str
     
-    @field_validator('full_name')
+    @field_validator('email')
     @classmethod
-    def validate_full_name(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Full name cannot be empty')
-        return v.strip()
+    def validate_email(cls, v):
+        return normalize_email(v)
     
     @field_validator('password')
     @classmethod
@@ -26,5 +24,14 @@ class UserCreate(BaseModel):
 
 class UserLogin(BaseModel):
     """Schema for user login"""
-    email: EmailStr
-    password: str
\ No newline at end of file
+    email: str
+    password: str
+    
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v):
+        return normalize_email(v)
+
+class UserStatusUpdate(BaseModel):
+    """Schema for updating a user's active status"""
+    status: bool
\ No newline at end of file